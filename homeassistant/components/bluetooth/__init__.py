@@ -1,19 +1,23 @@
 """The bluetooth integration."""
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-import fnmatch
+from fnmatch import translate
+from functools import lru_cache
 import logging
 import platform
-from typing import Final, TypedDict, Union
+import re
+import sys
+import time
+from typing import Any, Final, TypedDict, TypeVar, Union, cast
 
 from bleak import BleakError
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
-from lru import LRU  # pylint: disable=no-name-in-module
 
 from homeassistant import config_entries
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
@@ -47,6 +51,12 @@ UNAVAILABLE_TRACK_SECONDS: Final = 60 * 5
 
 SOURCE_LOCAL: Final = "local"
 
+# Bitmask values for the matched-addresses cache; a device that was first
+# seen without manufacturer_data has to be rematched once it appears since
+# we may think the device is unsupported otherwise.
+_MATCHED_WITHOUT_MFR_DATA: Final = 0b01
+_MATCHED_WITH_MFR_DATA: Final = 0b10
+
 
 @dataclass
 class BluetoothServiceInfoBleak(BluetoothServiceInfo):
@@ -58,6 +68,10 @@ class BluetoothServiceInfoBleak(BluetoothServiceInfo):
     internal details.
     """
 
+    # These objects are allocated for every advertisement so keep
+    # the subclass fields in slots to reduce the per-instance cost.
+    __slots__ = ("device", "advertisement")
+
     device: BLEDevice
     advertisement: AdvertisementData
 
@@ -66,18 +80,47 @@ class BluetoothServiceInfoBleak(BluetoothServiceInfo):
         cls, device: BLEDevice, advertisement_data: AdvertisementData, source: str
     ) -> BluetoothServiceInfoBleak:
         """Create a BluetoothServiceInfoBleak from an advertisement."""
+        if not (name := advertisement_data.local_name):
+            name = device.name or device.address
+        # Positional arguments skip building a kwargs dict for
+        # every advertisement
         return cls(
-            name=advertisement_data.local_name or device.name or device.address,
-            address=device.address,
-            rssi=device.rssi,
-            manufacturer_data=advertisement_data.manufacturer_data,
-            service_data=advertisement_data.service_data,
-            service_uuids=advertisement_data.service_uuids,
-            source=source,
-            device=device,
-            advertisement=advertisement_data,
+            name,
+            device.address,
+            device.rssi,
+            advertisement_data.manufacturer_data,
+            advertisement_data.service_data,
+            advertisement_data.service_uuids,
+            source,
+            device,
+            advertisement_data,
         )
 
+    @classmethod
+    def from_history_entry(
+        cls, device_adv_data: tuple[BLEDevice, AdvertisementData], source: str
+    ) -> BluetoothServiceInfoBleak:
+        """Create a BluetoothServiceInfoBleak from a scanner history entry.
+
+        Assigns the attributes directly instead of going through the
+        generated dataclass __init__ since history replay and discovery
+        listing build these in bulk.
+        """
+        device, advertisement_data = device_adv_data
+        self = cls.__new__(cls)
+        if not (name := advertisement_data.local_name):
+            name = device.name or device.address
+        self.name = name
+        self.address = device.address
+        self.rssi = device.rssi
+        self.manufacturer_data = advertisement_data.manufacturer_data
+        self.service_data = advertisement_data.service_data
+        self.service_uuids = advertisement_data.service_uuids
+        self.source = source
+        self.device = device
+        self.advertisement = advertisement_data
+        return self
+
 
 class BluetoothCallbackMatcherOptional(TypedDict, total=False):
     """Matcher for the bluetooth integration for callback optional fields."""
@@ -111,6 +154,8 @@ MANUFACTURER_ID: Final = "manufacturer_id"
 MANUFACTURER_DATA_START: Final = "manufacturer_data_start"
 
 
+_BLUETOOTH_DISCOVERY_CONTEXT: Final = {"source": config_entries.SOURCE_BLUETOOTH}
+
 BluetoothChange = Enum("BluetoothChange", "ADVERTISEMENT")
 BluetoothCallback = Callable[
     [Union[BluetoothServiceInfoBleak, BluetoothServiceInfo], BluetoothChange], None
@@ -193,17 +238,34 @@ def async_track_unavailable(
     return manager.async_track_unavailable(callback, address)
 
 
+ADAPTER_PROBE_CACHE_SECONDS: Final = 60
+
+# Single-entry (timestamp, result) cache mutated in place so no
+# global statement is needed.
+_ADAPTER_PROBE_CACHE: list[tuple[float, bool]] = []
+
+
 async def _async_has_bluetooth_adapter() -> bool:
     """Return if the device has a bluetooth adapter."""
     if platform.system() == "Darwin":  # CoreBluetooth is built in on MacOS hardware
         return True
     if platform.system() == "Windows":  # We don't have a good way to detect on windows
         return False
+    # Probing the adapters does D-Bus round-trips and setup can be
+    # re-run several times during startup and reload flows, so the
+    # result is cached for a short time.
+    now = time.monotonic()
+    if _ADAPTER_PROBE_CACHE and now - _ADAPTER_PROBE_CACHE[0][0] < (
+        ADAPTER_PROBE_CACHE_SECONDS
+    ):
+        return _ADAPTER_PROBE_CACHE[0][1]
     from bluetooth_adapters import (  # pylint: disable=import-outside-toplevel
         get_bluetooth_adapters,
     )
 
-    return bool(await get_bluetooth_adapters())
+    has_adapters = bool(await get_bluetooth_adapters())
+    _ADAPTER_PROBE_CACHE[:] = [(now, has_adapters)]
+    return has_adapters
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -252,46 +314,112 @@ async def async_unload_entry(
     return True
 
 
+def _make_safe_callback(callback: BluetoothCallback) -> BluetoothCallback:
+    """Wrap a callback so errors are logged without a try/except per dispatch.
+
+    The wrapper is created once at registration time which keeps the
+    error boundary out of the per-advertisement dispatch loop.
+    """
+
+    def _safe_callback(
+        service_info: BluetoothServiceInfoBleak | BluetoothServiceInfo,
+        change: BluetoothChange,
+    ) -> None:
+        try:
+            callback(service_info, change)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error in bluetooth callback")
+
+    return _safe_callback
+
+
+@lru_cache(maxsize=4096)
+def _compile_fnmatch(pattern: str) -> re.Pattern[str]:
+    """Compile a fnmatch pattern."""
+    return re.compile(translate(pattern))
+
+
+def _memorized_fnmatch(name: str, pattern: str) -> bool:
+    """Memorized version of fnmatch that has a larger lru_cache.
+
+    fnmatch re-translates the glob and relies on a small shared
+    lru_cache on every call which shows up at advertisement rates;
+    compiling once per pattern avoids that entirely. Patterns without
+    wildcards are reduced to a plain string comparison.
+    """
+    if "*" not in pattern and "?" not in pattern and "[" not in pattern:
+        return name == pattern
+    return bool(_compile_fnmatch(pattern).match(name))
+
+
+_MatcherT = TypeVar("_MatcherT", BluetoothMatcher, BluetoothCallbackMatcher)
+
+
+def _precompute_matcher(matcher: _MatcherT) -> _MatcherT:
+    """Precompute per-matcher data used on the advertisement hot path.
+
+    Returns a copy of the matcher with the string keys and values
+    interned so the per-advertisement dict probes and equality checks
+    take CPython's pointer-comparison fast path, and with the
+    manufacturer_data_start prefix converted from the manifest-provided
+    list of ints to bytes once instead of allocating a bytearray for
+    every advertisement.
+    """
+    prepared: dict[str, Any] = {
+        sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+        for key, value in matcher.items()
+    }
+    if MANUFACTURER_DATA_START in prepared:
+        prepared[MANUFACTURER_DATA_START] = bytes(prepared[MANUFACTURER_DATA_START])
+    return cast(_MatcherT, prepared)
+
+
 def _ble_device_matches(
     matcher: BluetoothCallbackMatcher | BluetoothMatcher,
-    device: BLEDevice,
-    advertisement_data: AdvertisementData,
+    address: str,
+    name: str,
+    service_uuids: frozenset[str],
+    manufacturer_data: dict[int, bytes],
 ) -> bool:
-    """Check if a ble device and advertisement_data matches the matcher."""
+    """Check if the advertisement fields match the matcher.
+
+    The caller extracts the fields from the BLEDevice and
+    AdvertisementData once per advertisement so the repeated attribute
+    lookups are not paid for every matcher.
+    """
     if (
         matcher_address := matcher.get(ADDRESS)
-    ) is not None and device.address != matcher_address:
+    ) is not None and address != matcher_address:
         return False
 
     if (
         matcher_local_name := matcher.get(LOCAL_NAME)
-    ) is not None and not fnmatch.fnmatch(
-        advertisement_data.local_name or device.name or device.address,
-        matcher_local_name,
-    ):
+    ) is not None and not _memorized_fnmatch(name, matcher_local_name):
         return False
 
     if (
         matcher_service_uuid := matcher.get(SERVICE_UUID)
-    ) is not None and matcher_service_uuid not in advertisement_data.service_uuids:
+    ) is not None and matcher_service_uuid not in service_uuids:
         return False
 
     if (
         (matcher_manfacturer_id := matcher.get(MANUFACTURER_ID)) is not None
-        and matcher_manfacturer_id not in advertisement_data.manufacturer_data
+        and matcher_manfacturer_id not in manufacturer_data
     ):
         return False
 
     if (
         matcher_manufacturer_data_start := matcher.get(MANUFACTURER_DATA_START)
     ) is not None:
-        matcher_manufacturer_data_start_bytes = bytearray(
-            matcher_manufacturer_data_start
-        )
-        if not any(
-            manufacturer_data.startswith(matcher_manufacturer_data_start_bytes)
-            for manufacturer_data in advertisement_data.manufacturer_data.values()
-        ):
+        # The matcher field is declared as a list of ints but
+        # _precompute_matcher converted it to bytes at registration
+        # time; the explicit for/else avoids the generator frame any()
+        # would pay for on every advertisement.
+        prefix = cast(bytes, matcher_manufacturer_data_start)
+        for mfr_data in manufacturer_data.values():
+            if mfr_data.startswith(prefix):
+                break
+        else:
             return False
 
     return True
@@ -307,17 +435,48 @@ class BluetoothManager:
     ) -> None:
         """Init bluetooth discovery."""
         self.hass = hass
-        self._integration_matchers = integration_matchers
+        # Pre-bucket the matchers by their most selective key so each
+        # advertisement only has to be checked against the matchers that
+        # could possibly match it instead of every registered matcher.
+        self._matchers_by_service_uuid: dict[str, list[BluetoothMatcher]] = {}
+        self._matchers_by_manufacturer_id: dict[int, list[BluetoothMatcher]] = {}
+        self._matchers_other: list[BluetoothMatcher] = []
+        for matcher in integration_matchers:
+            matcher = _precompute_matcher(matcher)
+            if service_uuid := matcher.get(SERVICE_UUID):
+                self._matchers_by_service_uuid.setdefault(service_uuid, []).append(
+                    matcher
+                )
+            elif (manufacturer_id := matcher.get(MANUFACTURER_ID)) is not None:
+                self._matchers_by_manufacturer_id.setdefault(
+                    manufacturer_id, []
+                ).append(matcher)
+            else:
+                self._matchers_other.append(matcher)
         self.scanner: HaBleakScanner | None = None
         self._cancel_device_detected: CALLBACK_TYPE | None = None
         self._cancel_unavailable_tracking: CALLBACK_TYPE | None = None
-        self._unavailable_callbacks: dict[str, list[Callable[[str], None]]] = {}
-        self._callbacks: list[
-            tuple[BluetoothCallback, BluetoothCallbackMatcher | None]
-        ] = []
-        # Some devices use a random address so we need to use
-        # an LRU to avoid memory issues.
-        self._matched: LRU = LRU(MAX_REMEMBER_ADDRESSES)
+        self._unavailable_callbacks: dict[str, set[Callable[[str], None]]] = {}
+        # Keyed by a monotonic registration id so unregistering is a
+        # single dict pop instead of an O(n) list remove. Callbacks whose
+        # matcher pins an address are indexed by that address so dispatch
+        # only has to look at the entries for the advertising device.
+        self._callbacks: dict[
+            int, tuple[BluetoothCallback, BluetoothCallbackMatcher | None]
+        ] = {}
+        self._callbacks_by_address: dict[
+            str, dict[int, tuple[BluetoothCallback, BluetoothCallbackMatcher]]
+        ] = {}
+        self._callback_id = 0
+        # Cached result of async_discovered_service_info, invalidated
+        # whenever the scanner history changes.
+        self._discovered_cache: list[BluetoothServiceInfoBleak] | None = None
+        # Some devices use a random address so we need to bound this
+        # cache with LRU eviction to avoid memory issues. The value is a
+        # bitmask of _MATCHED_WITHOUT_MFR_DATA / _MATCHED_WITH_MFR_DATA;
+        # membership alone is not enough since a device first seen
+        # without manufacturer_data must be rematched once it appears.
+        self._matched: OrderedDict[str, int] = OrderedDict()
 
     @hass_callback
     def async_setup(self) -> None:
@@ -363,14 +522,18 @@ class BluetoothManager:
             """Watch for unavailable devices."""
             scanner = self.scanner
             assert scanner is not None
-            history = set(scanner.history)
+            history = scanner.history
             active = {device.address for device in scanner.discovered_devices}
-            disappeared = history.difference(active)
+            disappeared = [address for address in history if address not in active]
+            if disappeared:
+                self._discovered_cache = None
             for address in disappeared:
-                del scanner.history[address]
+                del history[address]
                 if not (callbacks := self._unavailable_callbacks.get(address)):
                     continue
-                for callback in callbacks:
+                # Iterate a snapshot since a callback may cancel its
+                # own subscription while we dispatch, mutating the set
+                for callback in list(callbacks):
                     try:
                         callback(address)
                     except Exception:  # pylint: disable=broad-except
@@ -382,64 +545,134 @@ class BluetoothManager:
             timedelta(seconds=UNAVAILABLE_TRACK_SECONDS),
         )
 
+    def _async_candidate_matchers(
+        self, service_uuids: list[str], manufacturer_data: dict[int, bytes]
+    ) -> Iterable[BluetoothMatcher]:
+        """Yield the integration matchers that could match the advertisement.
+
+        Matchers keyed on a service uuid or manufacturer id are only
+        considered when the advertisement actually carries that key.
+        """
+        for service_uuid in service_uuids:
+            if matchers := self._matchers_by_service_uuid.get(service_uuid):
+                yield from matchers
+        for manufacturer_id in manufacturer_data:
+            if matchers := self._matchers_by_manufacturer_id.get(manufacturer_id):
+                yield from matchers
+        yield from self._matchers_other
+
     @hass_callback
     def _device_detected(
         self, device: BLEDevice, advertisement_data: AdvertisementData
     ) -> None:
         """Handle a detected device."""
+        # The scanner history was just updated with this advertisement
+        # so any cached discovery snapshot is stale, even if we bail out
+        # below.
+        self._discovered_cache = None
+
+        # Hoist the attribute lookups that repeat for every matcher out
+        # of the loops since this runs at advertisement rate. The
+        # frozenset turns the per-matcher service uuid check into a
+        # hash probe but is only built once matching or callback
+        # dispatch is actually going to run; the common already-seen
+        # advertisement bails out without paying for it.
+        address = device.address
+        name = advertisement_data.local_name or device.name or address
+        service_uuids = advertisement_data.service_uuids
+        manufacturer_data = advertisement_data.manufacturer_data
+        uuid_set: frozenset[str] | None = None
+
         matched_domains: set[str] | None = None
-        match_key = (device.address, bool(advertisement_data.manufacturer_data))
-        match_key_has_mfr_data = (device.address, True)
+        match_bit = (
+            _MATCHED_WITH_MFR_DATA if manufacturer_data else _MATCHED_WITHOUT_MFR_DATA
+        )
+        flags = self._matched.get(address, 0)
 
         # If we matched without manufacturer_data, we need to do it again
-        # since we may think the device is unsupported otherwise
-        if (
-            match_key_has_mfr_data not in self._matched
-            and match_key not in self._matched
-        ):
-            matched_domains = {
-                matcher["domain"]
-                for matcher in self._integration_matchers
-                if _ble_device_matches(matcher, device, advertisement_data)
-            }
+        # once it appears since we may think the device is unsupported otherwise
+        if not flags & (_MATCHED_WITH_MFR_DATA | match_bit):
+            matched_domains = set()
+            uuid_set = frozenset(service_uuids)
+            for matcher in self._async_candidate_matchers(
+                service_uuids, manufacturer_data
+            ):
+                # A domain commonly has multiple matchers; once one of
+                # them matched there is no point in running the rest.
+                domain = matcher["domain"]
+                if domain not in matched_domains and _ble_device_matches(
+                    matcher, address, name, uuid_set, manufacturer_data
+                ):
+                    matched_domains.add(domain)
             if matched_domains:
-                self._matched[match_key] = True
+                self._matched[address] = flags | match_bit
+                self._matched.move_to_end(address)
+                if len(self._matched) > MAX_REMEMBER_ADDRESSES:
+                    self._matched.popitem(last=False)
+
+        address_callbacks = self._callbacks_by_address.get(address)
+        if matched_domains is None and not self._callbacks and not address_callbacks:
+            # A previously seen device with no subscribers; bail out
+            # before paying for any logging overhead.
+            return
 
-        _LOGGER.debug(
-            "Device detected: %s with advertisement_data: %s matched domains: %s",
-            device,
-            advertisement_data,
-            matched_domains,
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            # AdvertisementData.__repr__ walks the manufacturer_data
+            # bytes so avoid building the record when debug is off.
+            _LOGGER.debug(
+                "Device detected: %s with advertisement_data: %s matched domains: %s",
+                device,
+                advertisement_data,
+                matched_domains,
+            )
 
-        if not matched_domains and not self._callbacks:
+        if not matched_domains and not self._callbacks and not address_callbacks:
             return
 
-        service_info: BluetoothServiceInfoBleak | None = None
-        for callback, matcher in self._callbacks:
-            if matcher is None or _ble_device_matches(
-                matcher, device, advertisement_data
+        if uuid_set is None:
+            uuid_set = frozenset(service_uuids)
+        matched_callbacks: list[BluetoothCallback] = []
+        if address_callbacks:
+            for callback, address_matcher in address_callbacks.values():
+                # The index already guarantees the address matched; only
+                # run the matcher when it constrains additional fields.
+                if len(address_matcher) == 1 or _ble_device_matches(
+                    address_matcher, address, name, uuid_set, manufacturer_data
+                ):
+                    matched_callbacks.append(callback)
+        for callback, callback_matcher in self._callbacks.values():
+            if callback_matcher is None or _ble_device_matches(
+                callback_matcher, address, name, uuid_set, manufacturer_data
             ):
-                if service_info is None:
-                    service_info = BluetoothServiceInfoBleak.from_advertisement(
-                        device, advertisement_data, SOURCE_LOCAL
-                    )
-                try:
-                    callback(service_info, BluetoothChange.ADVERTISEMENT)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception("Error in bluetooth callback")
+                matched_callbacks.append(callback)
+        if not matched_domains and not matched_callbacks:
+            return
+
+        service_info = BluetoothServiceInfoBleak(
+            name=name,
+            address=address,
+            rssi=device.rssi,
+            manufacturer_data=manufacturer_data,
+            service_data=advertisement_data.service_data,
+            service_uuids=service_uuids,
+            source=SOURCE_LOCAL,
+            device=device,
+            advertisement=advertisement_data,
+        )
+        # The callbacks were wrapped with their error boundary at
+        # registration time so no try/except is needed here.
+        for callback in matched_callbacks:
+            callback(service_info, BluetoothChange.ADVERTISEMENT)
 
         if not matched_domains:
             return
-        if service_info is None:
-            service_info = BluetoothServiceInfoBleak.from_advertisement(
-                device, advertisement_data, SOURCE_LOCAL
-            )
         for domain in matched_domains:
+            # Each flow needs its own copy of the context since flows
+            # write to it (unique_id assignment and similar).
             discovery_flow.async_create_flow(
                 self.hass,
                 domain,
-                {"source": config_entries.SOURCE_BLUETOOTH},
+                _BLUETOOTH_DISCOVERY_CONTEXT.copy(),
                 service_info,
             )
 
@@ -448,13 +681,18 @@ class BluetoothManager:
         self, callback: Callable[[str], None], address: str
     ) -> Callable[[], None]:
         """Register a callback."""
-        self._unavailable_callbacks.setdefault(address, []).append(callback)
+        # Registrations are stored in a set so registering the same
+        # callback twice for an address coalesces into a single entry
+        # and a single cancel removes it
+        self._unavailable_callbacks.setdefault(address, set()).add(callback)
 
         @hass_callback
         def _async_remove_callback() -> None:
-            self._unavailable_callbacks[address].remove(callback)
-            if not self._unavailable_callbacks[address]:
-                del self._unavailable_callbacks[address]
+            if not (callbacks := self._unavailable_callbacks.get(address)):
+                return
+            callbacks.discard(callback)
+            if not callbacks:
+                self._unavailable_callbacks.pop(address, None)
 
         return _async_remove_callback
 
@@ -465,12 +703,29 @@ class BluetoothManager:
         matcher: BluetoothCallbackMatcher | None = None,
     ) -> Callable[[], None]:
         """Register a callback."""
-        callback_entry = (callback, matcher)
-        self._callbacks.append(callback_entry)
+        if matcher:
+            matcher = _precompute_matcher(matcher)
+        self._callback_id += 1
+        callback_id = self._callback_id
+        safe_callback = _make_safe_callback(callback)
+        matcher_address = matcher.get(ADDRESS) if matcher else None
+        if matcher and matcher_address:
+            self._callbacks_by_address.setdefault(matcher_address, {})[callback_id] = (
+                safe_callback,
+                matcher,
+            )
+        else:
+            self._callbacks[callback_id] = (safe_callback, matcher)
 
         @hass_callback
         def _async_remove_callback() -> None:
-            self._callbacks.remove(callback_entry)
+            if matcher_address:
+                if entries := self._callbacks_by_address.get(matcher_address):
+                    entries.pop(callback_id, None)
+                    if not entries:
+                        del self._callbacks_by_address[matcher_address]
+                return
+            self._callbacks.pop(callback_id, None)
 
         # If we have history for the subscriber, we can trigger the callback
         # immediately with the last packet so the subscriber can see the
@@ -481,15 +736,12 @@ class BluetoothManager:
             and self.scanner
             and (device_adv_data := self.scanner.history.get(address))
         ):
-            try:
-                callback(
-                    BluetoothServiceInfoBleak.from_advertisement(
-                        *device_adv_data, SOURCE_LOCAL
-                    ),
-                    BluetoothChange.ADVERTISEMENT,
-                )
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Error in bluetooth callback")
+            safe_callback(
+                BluetoothServiceInfoBleak.from_history_entry(
+                    device_adv_data, SOURCE_LOCAL
+                ),
+                BluetoothChange.ADVERTISEMENT,
+            )
 
         return _async_remove_callback
 
@@ -507,12 +759,16 @@ class BluetoothManager:
 
     @hass_callback
     def async_discovered_service_info(self) -> list[BluetoothServiceInfoBleak]:
-        """Return if the address is present."""
+        """Return the discovered service info."""
         assert self.scanner is not None
-        return [
-            BluetoothServiceInfoBleak.from_advertisement(*device_adv, SOURCE_LOCAL)
-            for device_adv in self.scanner.history.values()
-        ]
+        if self._discovered_cache is None:
+            self._discovered_cache = [
+                BluetoothServiceInfoBleak.from_history_entry(device_adv, SOURCE_LOCAL)
+                for device_adv in self.scanner.history.values()
+            ]
+        # Hand out a shallow copy so callers cannot mutate the cache
+        # or each other's snapshots.
+        return self._discovered_cache.copy()
 
     async def async_stop(self, event: Event | None = None) -> None:
         """Stop bluetooth discovery."""
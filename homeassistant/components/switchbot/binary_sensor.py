@@ -7,7 +7,7 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -64,8 +64,10 @@ class SwitchBotBinarySensor(SwitchbotEntity, BinarySensorEntity):
         self._attr_unique_id = f"{unique_id}-{binary_sensor}"
         self._attr_name = f"{switchbot_name} {binary_sensor.title()}"
         self.entity_description = BINARY_SENSOR_TYPES[binary_sensor]
+        self._attr_is_on = self.data["data"].get(binary_sensor, False)
 
-    @property
-    def is_on(self) -> bool:
-        """Return the state of the sensor."""
-        return self.data["data"][self._sensor]
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_is_on = self.data["data"].get(self._sensor, False)
+        super()._handle_coordinator_update()
@@ -8,6 +8,7 @@ import pytest
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import (
+    MAX_REMEMBER_ADDRESSES,
     SOURCE_LOCAL,
     UNAVAILABLE_TRACK_SECONDS,
     BluetoothChange,
@@ -288,6 +289,124 @@ async def test_discovery_match_by_manufacturer_id_and_first_byte(
         assert len(mock_config_flow.mock_calls) == 0
 
 
+async def test_rediscovery_when_manufacturer_data_appears(
+    hass, mock_bleak_scanner_start
+):
+    """Test a device matched without manufacturer_data is rematched once it appears."""
+    mock_bt = [
+        {"domain": "switchbot", "local_name": "wohand"},
+        {
+            "domain": "homekit_controller",
+            "manufacturer_id": 76,
+            "manufacturer_data_start": [0x06],
+        },
+    ]
+    with patch(
+        "homeassistant.components.bluetooth.async_get_bluetooth", return_value=mock_bt
+    ):
+        assert await async_setup_component(
+            hass, bluetooth.DOMAIN, {bluetooth.DOMAIN: {}}
+        )
+        await hass.async_block_till_done()
+
+    with patch.object(hass.config_entries.flow, "async_init") as mock_config_flow:
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+
+        assert len(mock_bleak_scanner_start.mock_calls) == 1
+
+        device = BLEDevice("44:44:33:11:23:45", "wohand")
+        adv_without_mfr_data = AdvertisementData(local_name="wohand", service_uuids=[])
+
+        _get_underlying_scanner()._callback(device, adv_without_mfr_data)
+        await hass.async_block_till_done()
+
+        assert len(mock_config_flow.mock_calls) == 1
+        assert mock_config_flow.mock_calls[0][1][0] == "switchbot"
+        mock_config_flow.reset_mock()
+
+        # The appearance of manufacturer_data must trigger a rematch
+        # since the device may have been considered unsupported without it
+        adv_with_mfr_data = AdvertisementData(
+            local_name="wohand",
+            service_uuids=[],
+            manufacturer_data={76: b"\x06\x02\x03"},
+        )
+        _get_underlying_scanner()._callback(device, adv_with_mfr_data)
+        await hass.async_block_till_done()
+
+        assert {call[1][0] for call in mock_config_flow.mock_calls} == {
+            "switchbot",
+            "homekit_controller",
+        }
+        mock_config_flow.reset_mock()
+
+        # Once matched with manufacturer_data no more flows are created
+        _get_underlying_scanner()._callback(device, adv_with_mfr_data)
+        await hass.async_block_till_done()
+
+        assert len(mock_config_flow.mock_calls) == 0
+
+
+async def test_matched_devices_cache_is_bounded(hass, mock_bleak_scanner_start):
+    """Test the matched addresses cache evicts the oldest entries."""
+    mock_bt = [{"domain": "switchbot", "local_name": "wohand"}]
+    with patch(
+        "homeassistant.components.bluetooth.async_get_bluetooth", return_value=mock_bt
+    ):
+        assert await async_setup_component(
+            hass, bluetooth.DOMAIN, {bluetooth.DOMAIN: {}}
+        )
+        await hass.async_block_till_done()
+
+    with patch.object(hass.config_entries.flow, "async_init") as mock_config_flow:
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+
+        adv = AdvertisementData(local_name="wohand", service_uuids=[])
+        first_device = BLEDevice("44:44:33:11:00:00", "wohand")
+        _get_underlying_scanner()._callback(first_device, adv)
+        for i in range(1, MAX_REMEMBER_ADDRESSES + 1):
+            device = BLEDevice(f"44:44:33:11:{i >> 8:02X}:{i & 0xFF:02X}", "wohand")
+            _get_underlying_scanner()._callback(device, adv)
+        await hass.async_block_till_done()
+        mock_config_flow.reset_mock()
+
+        # The first address was evicted so it is discovered again
+        _get_underlying_scanner()._callback(first_device, adv)
+        await hass.async_block_till_done()
+
+        assert len(mock_config_flow.mock_calls) == 1
+        assert mock_config_flow.mock_calls[0][1][0] == "switchbot"
+
+
+async def test_discovered_service_info_cache(
+    hass, mock_bleak_scanner_start, enable_bluetooth
+):
+    """Test discovered service info is cached but each caller gets a private list."""
+    switchbot_device = BLEDevice("44:44:33:11:23:45", "wohand")
+    switchbot_adv = AdvertisementData(local_name="wohand", service_uuids=[])
+    _get_underlying_scanner()._callback(switchbot_device, switchbot_adv)
+    await hass.async_block_till_done()
+
+    first = bluetooth.async_discovered_service_info(hass)
+    second = bluetooth.async_discovered_service_info(hass)
+    assert first == second
+    assert first is not second
+
+    # Mutating a snapshot must not leak into other callers
+    first.clear()
+    assert len(bluetooth.async_discovered_service_info(hass)) == 1
+
+    # A new advertisement invalidates the cache
+    wrong_device = BLEDevice("44:44:33:11:23:42", "wrong_name")
+    wrong_adv = AdvertisementData(local_name="wrong_name", service_uuids=[])
+    _get_underlying_scanner()._callback(wrong_device, wrong_adv)
+    await hass.async_block_till_done()
+
+    assert len(bluetooth.async_discovered_service_info(hass)) == 2
+
+
 async def test_async_discovered_device_api(hass, mock_bleak_scanner_start):
     """Test the async_discovered_device API."""
     mock_bt = []
@@ -922,7 +1041,7 @@ async def test_can_unsetup_bluetooth(hass, mock_bleak_scanner_start, enable_blue
 
 async def test_auto_detect_bluetooth_adapters_linux(hass):
     """Test we auto detect bluetooth adapters on linux."""
-    with patch(
+    with patch.object(bluetooth, "_ADAPTER_PROBE_CACHE", []), patch(
         "bluetooth_adapters.get_bluetooth_adapters", return_value={"hci0"}
     ), patch(
         "homeassistant.components.bluetooth.platform.system", return_value="Linux"
@@ -935,7 +1054,9 @@ async def test_auto_detect_bluetooth_adapters_linux(hass):
 
 async def test_auto_detect_bluetooth_adapters_linux_none_found(hass):
     """Test we auto detect bluetooth adapters on linux with no adapters found."""
-    with patch("bluetooth_adapters.get_bluetooth_adapters", return_value=set()), patch(
+    with patch.object(bluetooth, "_ADAPTER_PROBE_CACHE", []), patch(
+        "bluetooth_adapters.get_bluetooth_adapters", return_value=set()
+    ), patch(
         "homeassistant.components.bluetooth.platform.system", return_value="Linux"
     ):
         assert await async_setup_component(hass, bluetooth.DOMAIN, {})